@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from functools import lru_cache
 from pathlib import Path
 
 from pydantic import AnyHttpUrl, Field
@@ -22,13 +21,20 @@ class Settings(BaseSettings):
 
     supabase_url: AnyHttpUrl = Field(alias="SUPABASE_URL")
     supabase_service_role_key: str = Field(alias="SUPABASE_SERVICE_ROLE_KEY")
+    supabase_db_url: str = Field(alias="SUPABASE_DB_URL")
     api_auth_key: str = Field(alias="LOAD_API_KEY")
     supabase_table: str = Field(default="loads", alias="SUPABASE_LOADS_TABLE")
     supabase_call_metrics_table: str = Field(
         default="call_metrics", alias="SUPABASE_CALL_METRICS_TABLE"
     )
+    supabase_max_connections: int = Field(
+        default=120, alias="SUPABASE_MAX_CONNECTIONS"
+    )
+    supabase_max_keepalive: int = Field(default=80, alias="SUPABASE_MAX_KEEPALIVE")
+    db_pool_min_size: int = Field(default=5, alias="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(default=20, alias="DB_POOL_MAX_SIZE")
+    db_statement_cache_size: int = Field(default=0, alias="DB_STATEMENT_CACHE_SIZE")
 
 
-@lru_cache
-def get_settings() -> Settings:
-    return Settings()
+# Settings are read once at import and shared by every module.
+SETTINGS = Settings()
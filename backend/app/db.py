@@ -1,152 +1,512 @@
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import List, Optional, Tuple
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
 
-from supabase import Client, create_client
+import asyncpg
+import httpx
+from cachetools import TTLCache
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
 
-from .config import get_settings
+from .config import SETTINGS
+from .pool import get_pool
 
 
-@lru_cache
-def get_supabase_client() -> Client:
-    settings = get_settings()
-    return create_client(str(settings.supabase_url), settings.supabase_service_role_key)
+logger = logging.getLogger(__name__)
 
 
-def fetch_loads(
+# Settings are fixed for the life of the process, so resolve the table names and
+# the SQL built from them once instead of on every query.
+_LOADS_TABLE = SETTINGS.supabase_table
+_CALL_METRICS_TABLE = SETTINGS.supabase_call_metrics_table
+
+# Column lists mirror the response models and cast where the Postgres type would
+# not round-trip into the model unchanged (routes build models without validation).
+_LOAD_COLUMN_SQL = {
+    "load_id": "load_id",
+    "load_booked": "load_booked",
+    "origin": "origin",
+    "destination": "destination",
+    "pickup_datetime": "pickup_datetime",
+    "delivery_datetime": "delivery_datetime",
+    "equipment_type": "equipment_type",
+    "loadboard_rate": "loadboard_rate::float8 AS loadboard_rate",
+    "notes": "notes",
+    "weight": "weight",
+    "commodity_type": "commodity_type",
+    "num_of_pieces": "num_of_pieces",
+    "miles": "miles",
+    "dimensions": "dimensions",
+}
+_LOAD_COLUMNS = ", ".join(_LOAD_COLUMN_SQL.values())
+# call_id is a uuid column; cast it so rows match the CallLog model's str field.
+_CALL_LOG_COLUMNS = "call_id::text AS call_id, load_id, call_started_at, sentiment, outcome"
+
+_COUNT_CALL_LOGS_SQL = f"SELECT count(*) FROM {_CALL_METRICS_TABLE}"
+# Planner row estimate for call_metrics. reltuples is -1 until the table has been
+# vacuumed or analyzed, so fall back to an exact count then.
+_CALL_LOGS_ESTIMATE = (
+    "(SELECT CASE WHEN reltuples >= 0 THEN reltuples::bigint "
+    f"ELSE ({_COUNT_CALL_LOGS_SQL}) END "
+    f"FROM pg_class WHERE oid = to_regclass('{_CALL_METRICS_TABLE}'))"
+)
+# One pass over the recent calls yields every dashboard aggregate: per-sentiment
+# and per-outcome counts plus the grand total (the empty grouping set).
+# GROUPING() tells the rows apart, since the grouped values themselves may be NULL.
+_METRICS_SUMMARY_SQL = (
+    "WITH recent AS ("
+    f" SELECT sentiment, outcome FROM {_CALL_METRICS_TABLE}"
+    " ORDER BY call_started_at DESC LIMIT $1"
+    ") "
+    "SELECT sentiment, outcome, GROUPING(sentiment) AS by_outcome,"
+    " GROUPING(outcome) AS by_sentiment, count(*) AS calls"
+    " FROM recent GROUP BY GROUPING SETS ((sentiment), (outcome), ())"
+)
+_GET_CALL_LOG_SQL = (
+    f"SELECT {_CALL_LOG_COLUMNS} FROM {_CALL_METRICS_TABLE} WHERE call_id = $1 LIMIT 1"
+)
+_FETCH_LOAD_SQL = f"SELECT {_LOAD_COLUMNS} FROM {_LOADS_TABLE} WHERE load_id = $1 LIMIT 1"
+_UPDATE_LOADS_BOOKED_SQL = (
+    f"UPDATE {_LOADS_TABLE} SET load_booked = $1 WHERE load_id = ANY($2::text[])"
+)
+_MAX_LOAD_RESULTS = 100
+
+# Short-lived read-through caches for lookups that polling agents repeat. They
+# are only touched from the event loop, so no locking is needed. Misses (None)
+# are not cached so a freshly created call log is visible immediately. Writes
+# made through this process evict their entries at once; writes made by other
+# workers or directly in the database show up once the entry expires (ttl).
+_CALL_LOG_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+_LOADS_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+# Bumped whenever loads / call logs are written through this process. A read
+# started under an older generation may have seen the pre-write rows, so its
+# result is returned to its callers but never stored in the cache.
+_LOADS_GENERATION = 0
+_CALL_LOG_GENERATION = 0
+
+# Cache misses currently being fetched, keyed like the caches above plus the
+# generation they started under. Concurrent requests for the same key (e.g. an
+# agent retrying) await the one query already in flight instead of each issuing
+# their own, but a request arriving after a write never joins a pre-write query.
+_INFLIGHT: Dict[tuple, asyncio.Future] = {}
+
+
+# httpx defaults to 10 keep-alive connections, which caps concurrent Supabase
+# writes well below what the API can serve.
+_SUPABASE_HTTP_LIMITS = httpx.Limits(
+    max_connections=SETTINGS.supabase_max_connections,
+    max_keepalive_connections=SETTINGS.supabase_max_keepalive,
+    keepalive_expiry=60,
+)
+
+# The async client is created on first use (or at startup, see main.lifespan) so
+# REST writes are awaited on the event loop instead of blocking a worker thread.
+_CLIENT: Optional[AsyncClient] = None
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+_CALL_METRICS_REST = None
+_CLIENT_LOCK = asyncio.Lock()
+
+
+async def get_supabase_client() -> AsyncClient:
+    global _CLIENT, _HTTP_CLIENT, _CALL_METRICS_REST
+    if _CLIENT is not None:
+        return _CLIENT
+
+    async with _CLIENT_LOCK:
+        if _CLIENT is None:
+            # HTTP/2 multiplexes concurrent writes over one TLS connection.
+            http_client = httpx.AsyncClient(limits=_SUPABASE_HTTP_LIMITS, http2=True)
+            client = await acreate_client(
+                str(SETTINGS.supabase_url),
+                SETTINGS.supabase_service_role_key,
+                options=AsyncClientOptions(httpx_client=http_client),
+            )
+            # Request builders only hold the session and table path; each
+            # insert/update/delete starts a fresh query from them, so one
+            # builder can serve every call.
+            _CALL_METRICS_REST = client.table(_CALL_METRICS_TABLE)
+            _HTTP_CLIENT = http_client
+            _CLIENT = client
+    return _CLIENT
+
+
+async def close_supabase_client() -> None:
+    global _CLIENT, _HTTP_CLIENT, _CALL_METRICS_REST
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+    _CLIENT = None
+    _CALL_METRICS_REST = None
+
+
+async def warm_up_connections() -> None:
+    """Open the REST and Postgres connections before the first request needs them.
+
+    Failures are only logged: the first real request will retry the connection
+    and report any error itself.
+    """
+    try:
+        rest = await _call_metrics_rest()
+        await rest.select("call_id").limit(1).execute()
+    except Exception:
+        logger.warning("Supabase REST warm-up failed", exc_info=True)
+    try:
+        await _fetchval("SELECT 1")
+    except RuntimeError:
+        logger.warning("Postgres pool warm-up failed", exc_info=True)
+
+
+async def _call_metrics_rest():
+    if _CALL_METRICS_REST is None:
+        await get_supabase_client()
+    return _CALL_METRICS_REST
+
+
+def _canonical_call_id(value: str) -> Optional[str]:
+    """Return `value` as a canonical (lowercase, hyphenated) uuid, or None.
+
+    call_id is a uuid column; anything else cannot match and would only make
+    Postgres raise a cast error. Caches are keyed on the canonical form, so
+    every spelling of an id shares one entry.
+    """
+    try:
+        return str(UUID(value))
+    except ValueError:
+        return None
+
+
+def _single_flight(key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Awaitable[Any]:
+    """Run `fetch` once for concurrent callers sharing `key`.
+
+    The query runs as its own task and every caller awaits it through shield(),
+    so one caller being cancelled (client disconnect) does not cancel the query
+    for the others.
+    """
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _INFLIGHT[key] = task
+
+        def _forget(done: asyncio.Future) -> None:
+            # A write may already have dropped (and a new read replaced) the entry.
+            if _INFLIGHT.get(key) is done:
+                del _INFLIGHT[key]
+
+        task.add_done_callback(_forget)
+    return asyncio.shield(task)
+
+
+async def _fetch(sql: str, *args: object) -> List[dict]:
+    """Run a read query on the asyncpg pool, surfacing failures as RuntimeError."""
+    try:
+        pool = await get_pool()
+        rows = await pool.fetch(sql, *args)
+    except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as exc:
+        raise RuntimeError(str(exc)) from exc
+    return [dict(row) for row in rows]
+
+
+async def _fetchval(sql: str, *args: object) -> object:
+    try:
+        pool = await get_pool()
+        return await pool.fetchval(sql, *args)
+    except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as exc:
+        raise RuntimeError(str(exc)) from exc
+
+
+async def _execute(sql: str, *args: object) -> str:
+    try:
+        pool = await get_pool()
+        return await pool.execute(sql, *args)
+    except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as exc:
+        raise RuntimeError(str(exc)) from exc
+
+
+def _contains_pattern(term: str) -> str:
+    """Build an ILIKE pattern matching `term` literally anywhere in the value.
+
+    Caller input is escaped so a stray % or _ neither widens the match nor
+    leaves pg_trgm without trigrams to look up (which forces a full scan).
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _load_projection(columns: Optional[Sequence[str]]) -> str:
+    """Build the SELECT list for `columns`, or every Load field when None.
+
+    Names are checked against the known Load fields because they are spliced
+    into the SQL text.
+    """
+    if columns is None:
+        return _LOAD_COLUMNS
+    unknown = [column for column in columns if column not in _LOAD_COLUMN_SQL]
+    if unknown or not columns:
+        raise ValueError(f"Unknown load columns: {', '.join(unknown) or '(none)'}")
+    return ", ".join(_LOAD_COLUMN_SQL[column] for column in columns)
+
+
+class _LoadSearch:
+    """One cached load search: its rows and, once a caller asked, their rendering."""
+
+    __slots__ = ("rows", "rendered")
+
+    def __init__(self, rows: List[dict]) -> None:
+        self.rows = rows
+        self.rendered: Any = None
+
+
+async def fetch_loads(
     origin: str,
     destination: str,
     equipment_type: str,
+    only_available: bool = True,
+    columns: Optional[Sequence[str]] = None,
 ) -> List[dict]:
-    settings = get_settings()
-    query = get_supabase_client().table(settings.supabase_table).select("*")
-    query = (
-        query.ilike("origin", f"%{origin}%")
-        .ilike("destination", f"%{destination}%")
-        .ilike("equipment_type", f"%{equipment_type}%")
+    """Search open loads; pass `columns` to fetch only a subset of Load fields."""
+    search = await _search_loads(
+        origin, destination, equipment_type, only_available, columns
     )
-    response = query.execute()
-    if getattr(response, "error", None):
-        raise RuntimeError(response.error)
-    return getattr(response, "data", []) or []
+    return search.rows
+
 
+async def fetch_loads_rendered(
+    origin: str,
+    destination: str,
+    equipment_type: str,
+    render: Callable[[List[dict]], Any],
+) -> Any:
+    """Search open loads and return `render(rows)`, cached next to the rows.
 
-def list_call_logs(
+    The rendered value expires and is invalidated together with the rows, so a
+    hit skips rendering as well as the query. `render` must be the same for
+    every caller.
+    """
+    search = await _search_loads(origin, destination, equipment_type, True, None)
+    if search.rendered is None:
+        search.rendered = render(search.rows)
+    return search.rendered
+
+
+async def _search_loads(
+    origin: str,
+    destination: str,
+    equipment_type: str,
+    only_available: bool,
+    columns: Optional[Sequence[str]],
+) -> _LoadSearch:
+    projection = _load_projection(columns)
+    cache_key = (
+        origin,
+        destination,
+        equipment_type,
+        only_available,
+        None if columns is None else tuple(columns),
+    )
+    cached = _LOADS_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    conditions: list[str] = []
+    args: list[object] = []
+    # Match each term against its own column so origin and destination are not
+    # interchangeable; the pg_trgm GIN indexes serve these ILIKE probes.
+    for column, term in (
+        ("origin", origin),
+        ("destination", destination),
+        ("equipment_type", equipment_type),
+    ):
+        term = term.strip()
+        if term:
+            args.append(_contains_pattern(term))
+            conditions.append(f"{column} ILIKE ${len(args)}")
+    if only_available:
+        conditions.append("load_booked = 'N'")
+    sql = f"SELECT {projection} FROM {_LOADS_TABLE}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    # Callers only offer a handful of loads, so never ship the whole table back.
+    # Soonest pickups first; load_id breaks ties so the capped page is stable.
+    sql += f" ORDER BY pickup_datetime, load_id LIMIT {_MAX_LOAD_RESULTS}"
+
+    async def run() -> _LoadSearch:
+        return _LoadSearch(await _fetch(sql, *args))
+
+    generation = _LOADS_GENERATION
+    search = await _single_flight(("loads", generation, *cache_key), run)
+    if generation == _LOADS_GENERATION:
+        _LOADS_CACHE[cache_key] = search
+    return search
+
+
+async def list_call_logs(
     limit: Optional[int] = None,
     offset: int = 0,
     order_desc: bool = True,
-) -> Tuple[List[dict], Optional[int]]:
-    settings = get_settings()
-    query = (
-        get_supabase_client()
-        .table(settings.supabase_call_metrics_table)
-        .select("*", count="exact")
-        .order("call_started_at", desc=order_desc)
+    before: Optional[Tuple[datetime, UUID]] = None,
+) -> Tuple[List[dict], int]:
+    """Return a page of call logs and the estimated total.
+
+    `before` is the (call_started_at, call_id) of the last row on the previous
+    page; call_id breaks ties so rows sharing that timestamp are not skipped.
+    """
+    direction = "DESC" if order_desc else "ASC"
+    # LIMIT NULL means "no limit" in Postgres, so an omitted limit needs no branch.
+    args: list[object] = [None if limit is None else max(limit, 0), max(offset, 0)]
+    where = ""
+    if before is not None:
+        # Keyset pagination: seek straight to the page via the
+        # (call_started_at, call_id) index instead of walking past `offset` rows.
+        args.extend(before)
+        where = "WHERE (c.call_started_at, c.call_id) < ($3, $4) "
+    # Fetch the page and the estimated total in one round-trip. The page is
+    # LEFT JOINed onto a single row so the total still comes back when the page
+    # is empty (offset past the end).
+    rows = await _fetch(
+        # The table alias makes ORDER BY use the uuid column (which the index
+        # covers) rather than the call_id::text output column.
+        f"WITH page AS (SELECT {_CALL_LOG_COLUMNS} FROM {_CALL_METRICS_TABLE} AS c "
+        f"{where}ORDER BY c.call_started_at {direction}, c.call_id {direction} "
+        "LIMIT $1 OFFSET $2) "
+        f"SELECT page.*, {_CALL_LOGS_ESTIMATE} AS total "
+        "FROM (SELECT 1) AS one LEFT JOIN page ON true "
+        f"ORDER BY page.call_started_at {direction}, page.call_id {direction}",
+        *args,
     )
-    if limit is not None:
-        start = max(offset, 0)
-        end = start + max(limit, 0) - 1
-        query = query.range(start, end)
-    response = query.execute()
-    if getattr(response, "error", None):
-        raise RuntimeError(response.error)
-    data = getattr(response, "data", []) or []
-    total = getattr(response, "count", None)
+    # The LEFT JOIN always yields at least one row.
+    total = rows[0].pop("total")
+    data = []
+    for row in rows:
+        row.pop("total", None)
+        if row["call_id"] is not None:
+            data.append(row)
     return data, total
 
 
-def fetch_call_logs(limit: Optional[int] = None) -> List[dict]:
-    data, _ = list_call_logs(limit=limit)
-    return data
+async def count_call_logs() -> int:
+    """Return the exact number of call logs (a full count; use sparingly)."""
+    total = await _fetchval(_COUNT_CALL_LOGS_SQL)
+    return int(total or 0)
 
 
-def create_call_log(payload: dict) -> dict:
-    settings = get_settings()
-    response = (
-        get_supabase_client()
-        .table(settings.supabase_call_metrics_table)
-        .insert(payload)
-        .execute()
-    )
+async def fetch_metrics_summary(limit: Optional[int] = None) -> dict:
+    """Count calls per raw sentiment and outcome value in a single query.
+
+    Only the grouped counts leave the database; the caller merges values that
+    differ just by case or whitespace.
+    """
+    rows = await _fetch(_METRICS_SUMMARY_SQL, limit)
+    summary: dict = {"total": 0, "sentiment": {}, "outcome": {}}
+    for row in rows:
+        if row["by_sentiment"] and row["by_outcome"]:
+            summary["total"] = row["calls"]
+        elif row["by_sentiment"]:
+            summary["sentiment"][row["sentiment"]] = row["calls"]
+        else:
+            summary["outcome"][row["outcome"]] = row["calls"]
+    return summary
+
+
+async def create_call_log(payload: dict) -> dict:
+    rest = await _call_metrics_rest()
+    response = await rest.insert(payload).execute()
     if getattr(response, "error", None):
         raise RuntimeError(response.error)
     data = getattr(response, "data", []) or []
     return data[0] if data else {}
 
 
-# def update_call_log(call_id: str, payload: dict) -> Optional[dict]:
-#     settings = get_settings()
-#     response = (
-#         get_supabase_client()
-#         .table(settings.supabase_call_metrics_table)
-#         .update(payload)
-#         .eq("call_id", call_id)
-#         .execute()
-#     )
-#     if getattr(response, "error", None):
-#         raise RuntimeError(response.error)
-#     data = getattr(response, "data", []) or []
-#     return data[0] if data else None
-
-
-# def delete_call_log(call_id: str) -> bool:
-#     settings = get_settings()
-#     response = (
-#         get_supabase_client()
-#         .table(settings.supabase_call_metrics_table)
-#         .delete()
-#         .eq("call_id", call_id)
-#         .select("call_id")
-#         .execute()
-#     )
-#     if getattr(response, "error", None):
-#         raise RuntimeError(response.error)
-#     data = getattr(response, "data", []) or []
-#     return bool(data)
-
-
-def get_call_log(call_id: str) -> Optional[dict]:
-    settings = get_settings()
-    response = (
-        get_supabase_client()
-        .table(settings.supabase_call_metrics_table)
-        .select("*")
-        .eq("call_id", call_id)
-        .limit(1)
-        .execute()
-    )
+async def update_call_log(call_id: str, payload: dict) -> Optional[dict]:
+    key = _canonical_call_id(call_id)
+    if key is None:
+        return None
+    rest = await _call_metrics_rest()
+    response = await rest.update(payload).eq("call_id", key).execute()
     if getattr(response, "error", None):
         raise RuntimeError(response.error)
+    _invalidate_call_log(key)
     data = getattr(response, "data", []) or []
     return data[0] if data else None
 
 
-def fetch_load(load_id: str) -> Optional[dict]:
-    settings = get_settings()
-    response = (
-        get_supabase_client()
-        .table(settings.supabase_table)
-        .select("*")
-        .eq("load_id", load_id)
-        .limit(1)
-        .execute()
-    )
+async def delete_call_log(call_id: str) -> bool:
+    key = _canonical_call_id(call_id)
+    if key is None:
+        return False
+    rest = await _call_metrics_rest()
+    # PostgREST returns the deleted rows, so an empty list means nothing matched.
+    response = await rest.delete().eq("call_id", key).execute()
     if getattr(response, "error", None):
         raise RuntimeError(response.error)
+    _invalidate_call_log(key)
     data = getattr(response, "data", []) or []
+    return bool(data)
+
+
+def _invalidate_call_log(key: str) -> None:
+    """Forget a call log after it was updated or deleted through this process."""
+    global _CALL_LOG_GENERATION
+    _CALL_LOG_CACHE.pop(key, None)
+    _INFLIGHT.pop(("call_log", _CALL_LOG_GENERATION, key), None)
+    _CALL_LOG_GENERATION += 1
+
+
+async def get_call_log(call_id: str) -> Optional[dict]:
+    key = _canonical_call_id(call_id)
+    if key is None:
+        return None
+    cached = _CALL_LOG_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    generation = _CALL_LOG_GENERATION
+    data = await _single_flight(
+        ("call_log", generation, key),
+        lambda: _fetch(_GET_CALL_LOG_SQL, UUID(key)),
+    )
+    if not data:
+        return None
+    if generation == _CALL_LOG_GENERATION:
+        _CALL_LOG_CACHE[key] = data[0]
+    return data[0]
+
+
+async def fetch_load(
+    load_id: str, columns: Optional[Sequence[str]] = None
+) -> Optional[dict]:
+    sql = _FETCH_LOAD_SQL
+    if columns is not None:
+        sql = (
+            f"SELECT {_load_projection(columns)} FROM {_LOADS_TABLE} "
+            "WHERE load_id = $1 LIMIT 1"
+        )
+    data = await _fetch(sql, load_id)
     return data[0] if data else None
 
 
-def update_load_booked(load_id: str, booked_value: str) -> None:
+async def update_load_booked(load_id: str, booked_value: str) -> None:
     """Update the load_booked field for a given load_id."""
-    settings = get_settings()
-    response = (
-        get_supabase_client()
-        .table(settings.supabase_table)
-        .update({"load_booked": booked_value})
-        .eq("load_id", load_id)
-        .execute()
-    )
-    if getattr(response, "error", None):
-        raise RuntimeError(response.error)
+    await update_loads_booked([load_id], booked_value)
+
+
+async def update_loads_booked(load_ids: Sequence[str], booked_value: str) -> int:
+    """Set load_booked on many loads in one statement; return the rows updated."""
+    if not load_ids:
+        return 0
+    result = await _execute(_UPDATE_LOADS_BOOKED_SQL, booked_value, list(load_ids))
+    # Booking changes which loads /get_loads may return.
+    invalidate_loads_cache()
+    # asyncpg returns the command tag, e.g. "UPDATE 3".
+    return int(result.rsplit(" ", 1)[-1])
+
+
+def invalidate_loads_cache() -> None:
+    """Drop cached load searches after loads have changed."""
+    global _LOADS_GENERATION
+    _LOADS_CACHE.clear()
+    # In-flight searches keyed on the old generation finish for their current
+    # callers but are no longer joinable or cached.
+    _LOADS_GENERATION += 1
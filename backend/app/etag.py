@@ -0,0 +1,31 @@
+"""Weak ETag helpers for conditional GET responses."""
+
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request
+
+
+def etag_for_body(body: bytes) -> str:
+    """Return a weak ETag for an already serialized response body."""
+
+    return f'W/"{hashlib.sha1(body).hexdigest()}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check ``If-None-Match`` using the weak comparison required for GET."""
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+__all__ = ["etag_for_body", "is_not_modified"]
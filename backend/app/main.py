@@ -1,19 +1,37 @@
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
-from .compat import ensure_httpx_proxy_support
+from .db import close_supabase_client, warm_up_connections
+from .pool import close_pool
 from .routes import call_logs_router, loads_router, metrics_router
+from .security import (
+    OPENAPI_SECURITY_SCHEME,
+    OPENAPI_SECURITY_SCHEME_NAME,
+    PUBLIC_PATHS,
+    APIKeyMiddleware,
+)
 
 
 # Configure root logger once so the entire app emits consistent structured logs.
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Ensure httpx respects proxy settings when HappyRobot routes traffic through Ngrok.
-ensure_httpx_proxy_support()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Build the async Supabase client and the asyncpg pool up front and open
+    # their connections, so the first request does not pay for TCP/TLS setup.
+    # Release both on shutdown.
+    await warm_up_connections()
+    yield
+    await close_supabase_client()
+    await close_pool()
 
 
 app = FastAPI(
@@ -23,8 +41,15 @@ app = FastAPI(
         "load discovery and call-metric workflows."
     ),
     version="0.1.0",
+    lifespan=lifespan,
+    # orjson encodes the large load / call log lists (with datetimes) far faster
+    # than the stdlib json encoder behind the default JSONResponse.
+    default_response_class=ORJSONResponse,
 )
 
+# Every endpoint except /health and the API docs requires the shared API key.
+app.add_middleware(APIKeyMiddleware)
+
 # Register all feature routers so clients get loads, metrics, and call logs.
 app.include_router(loads_router)
 app.include_router(call_logs_router)
@@ -36,6 +61,23 @@ async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
 
 
+def openapi_with_api_key() -> dict:
+    """Build the schema once, documenting the key the middleware enforces."""
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        schema.setdefault("components", {})["securitySchemes"] = {
+            OPENAPI_SECURITY_SCHEME_NAME: OPENAPI_SECURITY_SCHEME
+        }
+        schema["security"] = [{OPENAPI_SECURITY_SCHEME_NAME: []}]
+        for path in PUBLIC_PATHS & schema["paths"].keys():
+            for operation in schema["paths"][path].values():
+                operation["security"] = []
+    return app.openapi_schema
+
+
+app.openapi = openapi_with_api_key
+
+
 if __name__ == "__main__":
     import uvicorn
 
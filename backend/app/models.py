@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Load(BaseModel):
@@ -61,7 +61,17 @@ class CallLogUpdate(BaseModel):
 
 class CallLogListResponse(BaseModel):
     data: List[CallLog]
-    total: Optional[int] = None
+    total: int = Field(
+        description=(
+            "Estimated number of call logs, taken from Postgres planner "
+            "statistics (exact until the table is first analyzed). Use "
+            "GET /call_logs/count for an exact figure."
+        ),
+    )
+
+
+class CallLogCount(BaseModel):
+    total: int
 
 
 class CallMetricsSummary(BaseModel):
@@ -78,5 +88,6 @@ __all__ = [
     "CallLogCreate",
     "CallLogUpdate",
     "CallLogListResponse",
+    "CallLogCount",
     "CallMetricsSummary",
 ]
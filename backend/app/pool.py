@@ -0,0 +1,49 @@
+"""Shared asyncpg connection pool for direct Postgres queries."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import asyncpg
+
+from .config import SETTINGS
+
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Return the process-wide pool, creating it on first use."""
+
+    global _pool
+    if _pool is not None:
+        return _pool
+
+    async with _pool_lock:
+        if _pool is None:
+            # Supavisor (Supabase's pooler) runs in transaction mode, where
+            # server-side prepared statements cannot be reused across
+            # transactions, so asyncpg's statement cache is off by default.
+            # On a direct or session-mode connection set
+            # DB_STATEMENT_CACHE_SIZE (e.g. 100) so each connection prepares a
+            # query once and reuses its plan.
+            _pool = await asyncpg.create_pool(
+                SETTINGS.supabase_db_url,
+                min_size=SETTINGS.db_pool_min_size,
+                max_size=SETTINGS.db_pool_max_size,
+                max_inactive_connection_lifetime=300,
+                statement_cache_size=SETTINGS.db_statement_cache_size,
+            )
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+__all__ = ["close_pool", "get_pool"]
@@ -1,31 +1,56 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, Path, Query, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel
 
 from ..db import (
+    count_call_logs,
     create_call_log,
-    # delete_call_log,
+    delete_call_log,
     get_call_log,
     list_call_logs,
-    # update_call_log,
+    update_call_log,
+)
+from ..etag import etag_for_body, is_not_modified
+from ..models import (
+    CallLog,
+    CallLogCount,
+    CallLogCreate,
+    CallLogListResponse,
+    CallLogUpdate,
 )
-from ..models import CallLog, CallLogCreate, CallLogListResponse, CallLogUpdate
-from ..security import enforce_api_key
 
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["call_logs"], dependencies=[Depends(enforce_api_key)])
+router = APIRouter(tags=["call_logs"])
+
+
+def _to_row(values: dict) -> dict:
+    # call_started_at is the only non-JSON-native field, so format it directly
+    # rather than paying for model_dump(mode="json") on every field.
+    started_at = values.get("call_started_at")
+    if started_at is not None:
+        values["call_started_at"] = started_at.isoformat()
+    return values
+
+
+def _json_response(model: BaseModel) -> Response:
+    return Response(content=model.model_dump_json(), media_type="application/json")
 
 
 @router.post("/call_logs", response_model=CallLog, status_code=status.HTTP_201_CREATED)
 async def create_call_log_entry(payload: CallLogCreate) -> CallLog:
     # Persist the call log in Supabase using JSON-friendly values (dates -> ISO strings).
+    values = payload.model_dump()
     try:
-        record = create_call_log(payload.model_dump(mode="json"))
+        record = await create_call_log(_to_row(dict(values)))
     except RuntimeError as exc:
         logger.exception("Supabase insert failed for call_logs")
         raise HTTPException(
@@ -39,24 +64,41 @@ async def create_call_log_entry(payload: CallLogCreate) -> CallLog:
             detail="Call log created but response was empty",
         )
 
-    try:
-        return CallLog.model_validate(record)
-    except Exception as exc:  # pragma: no cover - defensive data validation
-        logger.exception("Invalid call log payload returned from Supabase")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Invalid call log payload in data store",
-        ) from exc
+    # Everything except call_id is what we just sent, so skip re-validating the echo.
+    return CallLog.model_construct(call_id=record.get("call_id"), **values)
 
 
 @router.get("/call_logs", response_model=CallLogListResponse)
 async def list_call_log_entries(
     limit: int = Query(50, ge=1, le=500, description="Maximum number of call logs."),
     offset: int = Query(0, ge=0, description="Number of records to skip."),
-) -> CallLogListResponse:
-    # Fetch a paginated slice from Supabase; FastAPI handles query param parsing.
+    before: Optional[datetime] = Query(
+        None,
+        description=(
+            "Keyset cursor: pass the call_started_at of the last record on the "
+            "previous page (together with before_call_id) to paginate without "
+            "deep offsets."
+        ),
+    ),
+    before_call_id: Optional[UUID] = Query(
+        None,
+        description=(
+            "call_id of the last record on the previous page; required with "
+            "`before` so calls sharing its timestamp are not skipped."
+        ),
+    ),
+) -> Response:
+    if (before is None) != (before_call_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="before and before_call_id must be passed together",
+        )
+    cursor = None if before is None else (before, before_call_id)
+    # Fetch a paginated slice from Postgres; FastAPI handles query param parsing.
     try:
-        records, total = list_call_logs(limit=limit, offset=offset)
+        records, total = await list_call_logs(
+            limit=limit, offset=offset, before=cursor
+        )
     except RuntimeError as exc:
         logger.exception("Supabase query failed for call_logs list")
         raise HTTPException(
@@ -64,14 +106,27 @@ async def list_call_log_entries(
             detail="Failed to retrieve call logs",
         ) from exc
 
-    call_logs: list[CallLog] = []
-    for record in records:
-        try:
-            call_logs.append(CallLog.model_validate(record))
-        except Exception:
-            logger.warning("Skipping invalid call log record: %s", record)
+    # Rows come from our own typed query, so skip re-validating every field, and
+    # return the serialized body so FastAPI does not re-validate it against
+    # response_model (kept for the OpenAPI schema) on the way out.
+    call_logs = [CallLog.model_construct(**record) for record in records]
+    result = CallLogListResponse.model_construct(data=call_logs, total=total)
+    return _json_response(result)
+
+
+@router.get("/call_logs/count", response_model=CallLogCount)
+async def count_call_log_entries() -> Response:
+    # Exact row count; kept off the list endpoint, which only reports an estimate.
+    try:
+        total = await count_call_logs()
+    except RuntimeError as exc:
+        logger.exception("Supabase count failed for call_logs")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to count call logs",
+        ) from exc
 
-    return CallLogListResponse(data=call_logs, total=total)
+    return ORJSONResponse({"total": total})
 
 
 @router.get(
@@ -80,11 +135,12 @@ async def list_call_log_entries(
     responses={status.HTTP_404_NOT_FOUND: {"description": "Call log not found"}},
 )
 async def get_call_log_entry(
+    request: Request,
     call_id: str = Path(..., description="Identifier of the call log"),
-) -> CallLog:
-    # Look up a single call log, returning 404 if Supabase has no match.
+) -> Response:
+    # Look up a single call log, returning 404 if Postgres has no match.
     try:
-        record = get_call_log(call_id)
+        record = await get_call_log(call_id)
     except RuntimeError as exc:
         logger.exception("Supabase lookup failed for call_logs")
         raise HTTPException(
@@ -98,6 +154,45 @@ async def get_call_log_entry(
             detail="Call log not found",
         )
 
+    body = CallLog.model_construct(**record).model_dump_json().encode("utf-8")
+    etag = etag_for_body(body)
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@router.patch(
+    "/call_logs/{call_id}",
+    response_model=CallLog,
+    responses={status.HTTP_404_NOT_FOUND: {"description": "Call log not found"}},
+)
+async def update_call_log_entry(
+    call_id: str,
+    payload: CallLogUpdate,
+) -> CallLog:
+    # Apply partial updates from the agent, guarding against empty payloads.
+    updates = _to_row(payload.model_dump(exclude_unset=True))
+    if not updates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields provided to update",
+        )
+
+    try:
+        record = await update_call_log(call_id, updates)
+    except RuntimeError as exc:
+        logger.exception("Supabase update failed for call_logs")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to update call log",
+        ) from exc
+
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Call log not found",
+        )
+
     try:
         return CallLog.model_validate(record)
     except Exception as exc:  # pragma: no cover - defensive data validation
@@ -108,77 +203,35 @@ async def get_call_log_entry(
         ) from exc
 
 
-# @router.patch(
-#     "/call_logs/{call_id}",
-#     response_model=CallLog,
-#     responses={status.HTTP_404_NOT_FOUND: {"description": "Call log not found"}},
-# )
-# async def update_call_log_entry(
-#     call_id: str,
-#     payload: CallLogUpdate,
-# ) -> CallLog:
-#     # Apply partial updates from the agent, guarding against empty payloads.
-#     updates = payload.model_dump(exclude_unset=True, mode="json")
-#     if not updates:
-#         raise HTTPException(
-#             status_code=status.HTTP_400_BAD_REQUEST,
-#             detail="No fields provided to update",
-#         )
-
-#     try:
-#         record = update_call_log(call_id, updates)
-#     except RuntimeError as exc:
-#         logger.exception("Supabase update failed for call_logs")
-#         raise HTTPException(
-#             status.HTTP_502_BAD_GATEWAY,
-#             detail="Failed to update call log",
-#         ) from exc
-
-#     if not record:
-#         raise HTTPException(
-#             status_code=status.HTTP_404_NOT_FOUND,
-#             detail="Call log not found",
-#         )
-
-#     try:
-#         return CallLog.model_validate(record)
-#     except Exception as exc:  # pragma: no cover - defensive data validation
-#         logger.exception("Invalid call log payload returned from Supabase")
-#         raise HTTPException(
-#             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-#             detail="Invalid call log payload in data store",
-#         ) from exc
-
-
-# @router.delete(
-#     "/call_logs/{call_id}",
-#     status_code=status.HTTP_204_NO_CONTENT,
-#     response_class=Response,
-#     responses={
-#         status.HTTP_404_NOT_FOUND: {"description": "Call log not found"},
-#         status.HTTP_502_BAD_GATEWAY: {
-#             "description": "Failed to delete call log due to upstream error"
-#         },
-#     },
-# )
-# async def delete_call_log_entry(call_id: str) -> Response:
-#     # Remove the call log and return an empty 204 response on success.
-#     try:
-#         deleted = delete_call_log(call_id)
-#     except RuntimeError as exc:
-#         logger.exception("Supabase delete failed for call_logs")
-#         raise HTTPException(
-#             status.HTTP_502_BAD_GATEWAY,
-#             detail="Failed to delete call log",
-#         ) from exc
-
-#     if not deleted:
-#         raise HTTPException(
-#             status_code=status.HTTP_404_NOT_FOUND,
-#             detail="Call log not found",
-#         )
-
-#     return Response(status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/call_logs/{call_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Call log not found"},
+        status.HTTP_502_BAD_GATEWAY: {
+            "description": "Failed to delete call log due to upstream error"
+        },
+    },
+)
+async def delete_call_log_entry(call_id: str) -> Response:
+    # Remove the call log and return an empty 204 response on success.
+    try:
+        deleted = await delete_call_log(call_id)
+    except RuntimeError as exc:
+        logger.exception("Supabase delete failed for call_logs")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to delete call log",
+        ) from exc
+
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Call log not found",
+        )
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 __all__ = ["router"]
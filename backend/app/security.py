@@ -1,34 +1,100 @@
 from __future__ import annotations
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import APIKeyHeader
+import hmac
+from typing import Optional, Tuple
 
-from .config import get_settings
+from fastapi import status
+from fastapi.responses import ORJSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from .config import SETTINGS
 
-api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 
+# Resolved once at import; compared in constant time on every request.
+_EXPECTED_API_KEY = SETTINGS.api_auth_key.encode("utf-8")
+_EXPECTED_API_KEY_LEN = len(_EXPECTED_API_KEY)
+_BEARER_PREFIX = b"bearer "
+_BEARER_PREFIX_LEN = len(_BEARER_PREFIX)
 
-def enforce_api_key(authorization: str = Depends(api_key_header)) -> None:
-    settings = get_settings()
+# Reachable without a key: the uptime check and the interactive API docs.
+PUBLIC_PATHS = frozenset(
+    {"/health", "/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"}
+)
+
+# How the key is described in the OpenAPI schema (and the docs' Authorize
+# button); APIKeyMiddleware is what enforces it.
+OPENAPI_SECURITY_SCHEME_NAME = "APIKeyHeader"
+OPENAPI_SECURITY_SCHEME = {"type": "apiKey", "in": "header", "name": "Authorization"}
+
+
+def check_authorization(authorization: Optional[bytes]) -> Optional[Tuple[int, str]]:
+    """Validate a raw Authorization header; return (status, detail) on failure."""
     if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing Authorization header",
-        )
-
-    scheme, _, token = authorization.partition(" ")
-    if scheme.lower() != "bearer" or not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authorization scheme",
-        )
-
-    if token != settings.api_auth_key:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Invalid API key",
-        )
-
-
-__all__ = ["enforce_api_key"]
+        return status.HTTP_401_UNAUTHORIZED, "Missing Authorization header"
+
+    # Only the scheme prefix is lowercased, not the whole header.
+    if (
+        len(authorization) <= _BEARER_PREFIX_LEN
+        or authorization[:_BEARER_PREFIX_LEN].lower() != _BEARER_PREFIX
+    ):
+        return status.HTTP_401_UNAUTHORIZED, "Invalid authorization scheme"
+
+    # compare_digest already reveals whether the lengths differ, so rejecting a
+    # wrong-length token up front leaks nothing new and skips the comparison.
+    token = authorization[_BEARER_PREFIX_LEN:]
+    if len(token) != _EXPECTED_API_KEY_LEN or not hmac.compare_digest(
+        token, _EXPECTED_API_KEY
+    ):
+        return status.HTTP_403_FORBIDDEN, "Invalid API key"
+
+    return None
+
+
+class APIKeyMiddleware:
+    """Require the shared API key on every request to a route outside PUBLIC_PATHS.
+
+    A plain ASGI middleware reads the header straight from the connection scope
+    once per request, instead of each router resolving a FastAPI dependency.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+                break
+
+        failure = check_authorization(authorization)
+        # Only rejected requests pay for route matching: paths no route serves
+        # fall through so the router answers them with a 404.
+        if failure is None or not _matches_route(scope):
+            await self.app(scope, receive, send)
+            return
+
+        status_code, detail = failure
+        response = ORJSONResponse({"detail": detail}, status_code=status_code)
+        await response(scope, receive, send)
+
+
+def _matches_route(scope: Scope) -> bool:
+    # Starlette puts the application in the scope before running middleware.
+    return any(
+        route.matches(scope)[0] != Match.NONE for route in scope["app"].router.routes
+    )
+
+
+__all__ = [
+    "APIKeyMiddleware",
+    "OPENAPI_SECURITY_SCHEME",
+    "OPENAPI_SECURITY_SCHEME_NAME",
+    "PUBLIC_PATHS",
+    "check_authorization",
+]
@@ -0,0 +1,18 @@
+-- Full-text search over the columns /get_loads filters on.
+--
+-- The generated column keeps the tsvector in sync with origin, destination and
+-- equipment_type, and the GIN index lets `search_tsv @@ plainto_tsquery(...)`
+-- probe the index instead of sequentially scanning the table with ILIKE.
+
+alter table public.loads
+  add column if not exists search_tsv tsvector
+  generated always as (
+    to_tsvector(
+      'simple',
+      coalesce(origin, '') || ' ' ||
+      coalesce(destination, '') || ' ' ||
+      coalesce(equipment_type, '')
+    )
+  ) stored;
+
+create index if not exists loads_search_gin on public.loads using gin (search_tsv);
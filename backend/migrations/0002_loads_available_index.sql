@@ -0,0 +1,5 @@
+-- /get_loads only returns loads that are still open, so index just those rows.
+
+create index if not exists loads_available
+  on public.loads (load_booked)
+  where load_booked = 'N';
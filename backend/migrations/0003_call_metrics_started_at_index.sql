@@ -0,0 +1,12 @@
+-- /call_logs pages through call_metrics newest first. A descending index on
+-- (call_started_at, call_id) serves both the ORDER BY and keyset (`before=` /
+-- `before_call_id=`) lookups; call_id breaks ties between calls that started at
+-- the same instant. INCLUDE-ing the remaining CallLog columns lets Postgres
+-- answer the page from the index alone.
+
+create index if not exists call_metrics_started_at_call_id_desc
+  on public.call_metrics (call_started_at desc, call_id desc)
+  include (load_id, sentiment, outcome);
+
+-- Earlier revisions of this migration indexed call_started_at alone.
+drop index if exists public.call_metrics_started_at_desc;
@@ -0,0 +1,21 @@
+-- Trigram indexes for the substring filters /get_loads applies.
+--
+-- Each search term is matched against its own column with ILIKE '%term%'. A
+-- leading wildcard defeats B-tree indexes, but pg_trgm's GIN operator class
+-- serves ILIKE directly, so each filter probes an index instead of scanning the
+-- table. Per-column matching also keeps origin and destination apart, which the
+-- combined search_tsv document from 0001 could not do: a Chicago -> Dallas
+-- search matched Dallas -> Chicago loads too.
+
+create extension if not exists pg_trgm;
+
+create index if not exists loads_origin_trgm
+  on public.loads using gin (origin gin_trgm_ops);
+create index if not exists loads_destination_trgm
+  on public.loads using gin (destination gin_trgm_ops);
+create index if not exists loads_equipment_type_trgm
+  on public.loads using gin (equipment_type gin_trgm_ops);
+
+-- The full-text column is no longer queried.
+drop index if exists public.loads_search_gin;
+alter table public.loads drop column if exists search_tsv;
@@ -0,0 +1,13 @@
+-- Records the sha256 of the seed file each table was last loaded from, so the
+-- seed scripts can skip a table whose seed file has not changed.
+--
+-- Row level security is enabled with no policies: only the service role the
+-- seed scripts authenticate as (which bypasses RLS) can read or write it.
+
+create table if not exists public.seed_state (
+  key text primary key,
+  digest text not null,
+  seeded_at timestamptz not null default now()
+);
+
+alter table public.seed_state enable row level security;
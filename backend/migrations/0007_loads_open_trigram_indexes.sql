@@ -0,0 +1,23 @@
+-- Restrict the /get_loads trigram indexes to open loads.
+--
+-- fetch_loads always adds `load_booked = 'N'`, so partial indexes with that
+-- predicate serve the same searches. They skip every booked load, which keeps
+-- them smaller, and a booked load drops out of them instead of still being
+-- matched and then filtered out.
+--
+-- A search with only_available=False (no current caller) falls back to a
+-- sequential scan.
+
+create index if not exists loads_open_origin_trgm
+  on public.loads using gin (origin gin_trgm_ops)
+  where load_booked = 'N';
+create index if not exists loads_open_destination_trgm
+  on public.loads using gin (destination gin_trgm_ops)
+  where load_booked = 'N';
+create index if not exists loads_open_equipment_type_trgm
+  on public.loads using gin (equipment_type gin_trgm_ops)
+  where load_booked = 'N';
+
+drop index if exists public.loads_origin_trgm;
+drop index if exists public.loads_destination_trgm;
+drop index if exists public.loads_equipment_type_trgm;
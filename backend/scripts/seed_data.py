@@ -0,0 +1,49 @@
+"""Read the JSON seed files shared by `seed_supabase.py` and `seed_supabase_api.py`."""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Iterator
+
+import ijson
+
+
+def _iter_json_array(
+    path: Path, description: str, use_float: bool
+) -> Iterator[dict[str, object]]:
+    """Stream the objects of a top-level JSON array one at a time.
+
+    ijson parses incrementally, so only the records currently being written are
+    held in memory rather than the whole file. Numbers come back as Decimal
+    unless `use_float` is set.
+    """
+    with path.open("rb") as json_file:
+        # ijson yields nothing for a non-array document, so check explicitly.
+        if json_file.read(64).lstrip()[:1] != b"[":
+            raise ValueError(f"{description} must be a list of objects")
+        json_file.seek(0)
+        yield from ijson.items(json_file, "item", use_float=use_float)
+
+
+def load_seed_data(path: Path, use_float: bool = False) -> Iterator[dict[str, object]]:
+    """Load seed data – stream JSON records and ensure default booking state."""
+    for record in _iter_json_array(path, "Seed data", use_float):
+        record.setdefault("load_booked", "Y")
+        yield record
+
+
+def load_call_log_seed_data(
+    path: Path, use_float: bool = False
+) -> Iterator[dict[str, object]]:
+    """Load call log seed data – stream JSON array of call log entries."""
+    return _iter_json_array(path, "Call log seed data", use_float)
+
+
+def file_digest(path: Path) -> str:
+    """Return the sha256 hex digest of a seed file."""
+    with path.open("rb") as seed_file:
+        return hashlib.file_digest(seed_file, "sha256").hexdigest()
+
+
+__all__ = ["file_digest", "load_call_log_seed_data", "load_seed_data"]
@@ -0,0 +1,235 @@
+"""Seed or reseed Supabase tables for loads and call logs over direct Postgres.
+
+This script is the direct-database counterpart of `seed_supabase_api.py`. It
+connects with psycopg using `SUPABASE_DB_URL` instead of going through the
+Supabase REST API, which lets the whole dataset move in a handful of round
+trips instead of one HTTP request per batch:
+
+1. The freight `loads` table from `backend/data/loads.json` is truncated and
+   reloaded with a single `COPY ... FROM STDIN`.
+2. The call metrics table (call logs) is reloaded from
+   `backend/data/call_logs.json` when present.
+
+For each target table the script:
+  • Clears existing rows.
+  • Loads the JSON payload.
+
+The whole run is a single transaction (each table's reload is a savepoint inside
+it), so a failed run leaves the previous data of every table in place.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import sys
+from typing import Iterable, Iterator
+
+import psycopg
+from dotenv import load_dotenv
+
+from seed_data import file_digest, load_call_log_seed_data, load_seed_data
+
+# Environment setup – resolve project paths and look for an optional .env file.
+BASE_DIR = Path(__file__).resolve().parents[1]
+LOADS_DATA_PATH = BASE_DIR / "data" / "loads.json"
+CALL_LOGS_DATA_PATH = BASE_DIR / "data" / "call_logs.json"
+ENV_PATH = BASE_DIR.parent / ".env"
+
+# Environment setup – load .env automatically so local runs inherit Supabase creds.
+if load_dotenv(ENV_PATH):
+    print("Loaded environment variables from .env file")
+
+# Environment setup – read the Postgres connection string and fail fast if missing.
+try:
+    SUPABASE_DB_URL = os.environ["SUPABASE_DB_URL"]
+except KeyError as exc:
+    raise RuntimeError(
+        "SUPABASE_DB_URL must be set in your environment or .env file"
+    ) from exc
+
+LOADS_TABLE_NAME = os.getenv("SUPABASE_LOADS_TABLE", "loads")
+CALL_LOGS_TABLE_NAME = os.getenv("SUPABASE_CALL_METRICS_TABLE", "call_metrics")
+# Tables whose seed file hash matches the one stored in seed_state are skipped;
+# set SEED_FORCE=1 to reseed them anyway.
+SEED_FORCE = os.getenv("SEED_FORCE", "").lower() in {"1", "true", "yes"}
+
+LOAD_COLUMNS = (
+    "load_id",
+    "load_booked",
+    "origin",
+    "destination",
+    "pickup_datetime",
+    "delivery_datetime",
+    "equipment_type",
+    "loadboard_rate",
+    "notes",
+    "weight",
+    "commodity_type",
+    "num_of_pieces",
+    "miles",
+    "dimensions",
+)
+CALL_LOG_COLUMNS = ("load_id", "call_started_at", "sentiment", "outcome")
+
+_LOAD_COLUMN_LIST = ", ".join(LOAD_COLUMNS)
+
+# Text-format COPY lets Postgres parse the ISO timestamps and numbers exactly as
+# they appear in the JSON seed file. The table is truncated first, so rows can be
+# copied straight in with no staging table or conflict handling.
+COPY_LOADS_SQL = f"COPY public.{LOADS_TABLE_NAME} ({_LOAD_COLUMN_LIST}) FROM STDIN"
+CLEAR_LOADS_SQL = f"TRUNCATE TABLE public.{LOADS_TABLE_NAME} RESTART IDENTITY"
+
+CLEAR_CALL_LOGS_SQL = f"TRUNCATE TABLE public.{CALL_LOGS_TABLE_NAME} RESTART IDENTITY"
+INSERT_CALL_LOG_SQL = (
+    f"INSERT INTO public.{CALL_LOGS_TABLE_NAME} ({', '.join(CALL_LOG_COLUMNS)}) "
+    f"VALUES ({', '.join(f'%({column})s' for column in CALL_LOG_COLUMNS)})"
+)
+
+GET_SEED_DIGEST_SQL = "SELECT digest FROM public.seed_state WHERE key = %s"
+RECORD_SEED_DIGEST_SQL = (
+    "INSERT INTO public.seed_state (key, digest) VALUES (%s, %s) "
+    "ON CONFLICT (key) DO UPDATE SET digest = excluded.digest, seeded_at = now()"
+)
+
+
+def get_seed_digest(connection: psycopg.Connection, key: str) -> str | None:
+    """Fetch the digest recorded for `key` in seed_state, if any."""
+    try:
+        # Savepoint, so a missing seed_state table does not abort the reseed.
+        with connection.transaction(), connection.cursor() as cur:
+            cur.execute(GET_SEED_DIGEST_SQL, (key,))
+            row = cur.fetchone()
+    except psycopg.errors.UndefinedTable:
+        # seed_state is optional (see backend/migrations); without it every run
+        # simply reseeds.
+        return None
+    return row[0] if row else None
+
+
+def record_seed_digest(connection: psycopg.Connection, key: str, digest: str) -> None:
+    """Store the digest of the seed file `key` was just loaded from.
+
+    This runs inside main()'s reseed transaction, so the digest commits only
+    together with the data it describes. If any table fails, the whole run
+    rolls back and no digest is recorded, so the next run reseeds.
+    """
+    try:
+        # Savepoint, so a missing seed_state table does not abort the reseed.
+        with connection.transaction(), connection.cursor() as cur:
+            cur.execute(RECORD_SEED_DIGEST_SQL, (key, digest))
+    except psycopg.errors.UndefinedTable:
+        pass
+
+
+def is_already_seeded(connection: psycopg.Connection, key: str, digest: str) -> bool:
+    if SEED_FORCE:
+        return False
+    if get_seed_digest(connection, key) == digest:
+        print(
+            f"{key} already seeded from this file; "
+            "skipping (set SEED_FORCE=1 to reseed)."
+        )
+        return True
+    return False
+
+
+def reload_loads(connection: psycopg.Connection, loads: Iterable[dict[str, object]]) -> int:
+    """Replace the loads table contents with the seed loads in one COPY."""
+    count = 0
+    with connection.transaction(), connection.cursor() as cur:
+        cur.execute(CLEAR_LOADS_SQL)
+        with cur.copy(COPY_LOADS_SQL) as copy:
+            for record in loads:
+                copy.write_row(tuple(record.get(column) for column in LOAD_COLUMNS))
+                count += 1
+    return count
+
+
+def insert_call_logs(
+    connection: psycopg.Connection, call_logs: Iterable[dict[str, object]]
+) -> int:
+    """Replace the call metrics table contents with the seed call logs."""
+    count = 0
+
+    def rows() -> Iterator[dict[str, object]]:
+        nonlocal count
+        for record in call_logs:
+            count += 1
+            yield {column: record.get(column) for column in CALL_LOG_COLUMNS}
+
+    # Pipeline mode streams the TRUNCATE and every INSERT without waiting for
+    # each reply, so the reload costs about one round trip instead of one per row.
+    with connection.transaction(), connection.pipeline(), connection.cursor() as cur:
+        cur.execute(CLEAR_CALL_LOGS_SQL)
+        # No RETURNING, so psycopg can skip collecting a result per row.
+        cur.executemany(INSERT_CALL_LOG_SQL, rows(), returning=False)
+    return count
+
+
+def seed_loads_table(connection: psycopg.Connection) -> None:
+    """Seed the loads table from loads.json."""
+    if not LOADS_DATA_PATH.exists():
+        print("No loads.json file found; skipping loads seeding.")
+        return
+
+    digest = file_digest(LOADS_DATA_PATH)
+    if is_already_seeded(connection, LOADS_TABLE_NAME, digest):
+        return
+
+    loads = load_seed_data(LOADS_DATA_PATH)
+    try:
+        count = reload_loads(connection, loads)
+    except psycopg.errors.UndefinedTable:
+        print(
+            f"Table {LOADS_TABLE_NAME} does not exist. "
+            "Create it first (see README: Supabase Table Setup)."
+        )
+        return
+    record_seed_digest(connection, LOADS_TABLE_NAME, digest)
+    print(f"Reseeded {LOADS_TABLE_NAME} with {count} rows")
+
+
+def seed_call_logs_table(connection: psycopg.Connection) -> None:
+    """Seed the call metrics table from call_logs.json when available."""
+    if not CALL_LOGS_DATA_PATH.exists():
+        print("No call_logs.json file found; skipping call log seeding.")
+        return
+
+    digest = file_digest(CALL_LOGS_DATA_PATH)
+    if is_already_seeded(connection, CALL_LOGS_TABLE_NAME, digest):
+        return
+
+    call_logs = load_call_log_seed_data(CALL_LOGS_DATA_PATH)
+    try:
+        count = insert_call_logs(connection, call_logs)
+    except psycopg.errors.UndefinedTable:
+        print(
+            f"Table {CALL_LOGS_TABLE_NAME} does not exist. "
+            "Create it first (see README: Supabase Table Setup)."
+        )
+        return
+    record_seed_digest(connection, CALL_LOGS_TABLE_NAME, digest)
+    print(f"Reseeded {CALL_LOGS_TABLE_NAME} with {count} rows")
+
+
+def main() -> None:
+    # Connect to Postgres – prepare_threshold=1 prepares the call log INSERT
+    # server-side on first use so the remaining rows skip parse/plan. That needs
+    # a direct or session-mode connection, not Supavisor's transaction mode.
+    try:
+        connection = psycopg.connect(SUPABASE_DB_URL, prepare_threshold=1)
+    except psycopg.OperationalError as e:
+        print(f"Failed to connect to Postgres: {e}")
+        sys.exit(1)
+
+    # The whole reseed runs in this one transaction, so WAL is flushed once and
+    # a failure in any table rolls every table back. The per-table
+    # `connection.transaction()` blocks nested inside it become savepoints.
+    with connection, connection.transaction():
+        seed_loads_table(connection)
+        seed_call_logs_table(connection)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,25 +9,30 @@ instead of direct Postgres access. It can reset and seed:
 For each target table the script:
   • Ensures the table is reachable.
   • Clears existing rows (optional for first-time runs).
-  • Inserts the JSON payload in manageable batches.
+  • Streams the JSON payload and inserts it in large batches (`SEED_BATCH_SIZE`,
+    default 5000), halving any batch the API rejects as too large.
 """
 
 from __future__ import annotations
 
-import os, json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Sequence
+from typing import Iterable, Sequence
 import sys
 
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from postgrest.types import ReturnMethod
+from supabase import Client, ClientOptions, create_client
 
 # Environment setup – resolve project paths and look for an optional .env file.
 BASE_DIR = Path(__file__).resolve().parents[1]
 if str(BASE_DIR) not in sys.path:
     sys.path.insert(0, str(BASE_DIR))
 
-from app.compat import ensure_httpx_proxy_support
+from seed_data import file_digest, load_call_log_seed_data, load_seed_data
 
 LOADS_DATA_PATH = BASE_DIR / "data" / "loads.json"
 CALL_LOGS_DATA_PATH = BASE_DIR / "data" / "call_logs.json"
@@ -48,33 +53,62 @@ except KeyError as exc:
 
 LOADS_TABLE_NAME = os.getenv("SUPABASE_LOADS_TABLE", "loads")
 CALL_LOGS_TABLE_NAME = os.getenv("SUPABASE_CALL_METRICS_TABLE", "call_metrics")
+# Rows per PostgREST request. Seeding is round-trip bound, so send as many rows
+# per request as the API accepts; oversized batches are split automatically.
+SEED_BATCH_SIZE = int(os.getenv("SEED_BATCH_SIZE", "5000"))
+# Batches written at once. After the clear the batches are independent, so they
+# can be in flight together on the shared session.
+SEED_CONCURRENCY = max(int(os.getenv("SEED_CONCURRENCY", "4")), 1)
+# Tables whose seed file hash matches the one stored in seed_state are skipped;
+# set SEED_FORCE=1 to reseed them anyway.
+SEED_FORCE = os.getenv("SEED_FORCE", "").lower() in {"1", "true", "yes"}
+SEED_STATE_TABLE_NAME = "seed_state"
+
+
+def get_seed_digest(supabase: Client, key: str) -> str | None:
+    """Fetch the digest recorded for `key` in seed_state, if any."""
+    try:
+        response = (
+            supabase.table(SEED_STATE_TABLE_NAME)
+            .select("digest")
+            .eq("key", key)
+            .limit(1)
+            .execute()
+        )
+    except Exception as e:
+        # seed_state is optional (see backend/migrations); without it every run
+        # simply reseeds.
+        print(f"Could not read {SEED_STATE_TABLE_NAME} ({e}); seeding unconditionally")
+        return None
+    data = getattr(response, "data", []) or []
+    return data[0]["digest"] if data else None
+
+
+def record_seed_digest(supabase: Client, key: str, digest: str) -> None:
+    """Store the digest of the seed file `key` was just loaded from.
+
+    Call this only after every batch for the table has been written.
+    write_batches raises on any failed batch, so a partial reseed never
+    records a digest and the next run reseeds the table.
+    """
+    try:
+        supabase.table(SEED_STATE_TABLE_NAME).upsert(
+            {"key": key, "digest": digest}
+        ).execute()
+    except Exception as e:
+        print(f"Warning: Could not record seed digest for {key}: {e}")
 
 
-def load_seed_data(path: Path) -> list[dict[str, object]]:
-    """Load seed data – parse JSON and ensure default booking state."""
-    with path.open("r", encoding="utf-8") as json_file:
-        payload = json.load(json_file)
-    if not isinstance(payload, list):
-        raise ValueError("Seed data must be a list of load objects")
-    normalized: list[dict[str, object]] = []
-    for item in payload:
-        record = dict(item)
-        record.setdefault("load_booked", "Y")
-        normalized.append(record)
-    return normalized
-
-
-def load_call_log_seed_data(path: Path) -> list[dict[str, object]]:
-    """Load call log seed data – parse JSON array of call log entries."""
-    with path.open("r", encoding="utf-8") as json_file:
-        payload = json.load(json_file)
-    if not isinstance(payload, list):
-        raise ValueError("Call log seed data must be a list of objects")
-    normalized: list[dict[str, object]] = []
-    for item in payload:
-        record = dict(item)
-        normalized.append(record)
-    return normalized
+def is_already_seeded(supabase: Client, key: str, digest: str) -> bool:
+    if SEED_FORCE:
+        return False
+    if get_seed_digest(supabase, key) == digest:
+        print(
+            f"\n{key} already seeded from this file; "
+            "skipping (set SEED_FORCE=1 to reseed)."
+        )
+        return True
+    return False
 
 
 def clear_table(
@@ -84,7 +118,16 @@ def clear_table(
     *,
     sentinel: str | None = None,
 ) -> None:
-    """Clear all data from a Supabase table using its primary key."""
+    """Clear all data from a Supabase table, preferring TRUNCATE over DELETE."""
+    try:
+        # Reset table – TRUNCATE via the truncate_seed_table RPC (see
+        # backend/migrations) avoids scanning and deleting every row.
+        supabase.rpc("truncate_seed_table", {"table_name": table_name}).execute()
+        print(f"Truncated existing data from {table_name} table")
+        return
+    except Exception as e:
+        print(f"truncate_seed_table RPC unavailable ({e}); falling back to DELETE")
+
     try:
         # Reset table (if present) – delete all rows to reseed cleanly.
         if sentinel is None:
@@ -106,36 +149,89 @@ def check_table_exists(supabase: Client, table_name: str) -> bool:
         return False
 
 
+class PayloadTooLarge(Exception):
+    """The API rejected a request body or URL as too large (HTTP 413/414)."""
+
+
+def _reject_oversized(response: httpx.Response) -> None:
+    """httpx response hook: surface 413/414 by status code.
+
+    postgrest-py turns a JSON error body into an APIError without the HTTP
+    status, and Kong's 413 body (`{"message":"Request size limit exceeded"}`)
+    carries no code either, so the status is checked here instead.
+    """
+    if response.status_code in (413, 414):
+        raise PayloadTooLarge(f"HTTP {response.status_code}")
+
+
+def write_batch(
+    supabase: Client,
+    table_name: str,
+    batch: Sequence[dict[str, object]],
+    method: str,
+) -> None:
+    """Write one batch, halving it and retrying if the API rejects its size."""
+    table = supabase.table(table_name)
+    # PostgREST echoes every written row back by default; the seeder never reads
+    # them, so ask for an empty response and halve the bytes each batch moves.
+    try:
+        if method == "insert":
+            response = table.insert(list(batch), returning=ReturnMethod.minimal).execute()
+        else:
+            response = table.upsert(list(batch), returning=ReturnMethod.minimal).execute()
+    except PayloadTooLarge:
+        if len(batch) < 2:
+            raise
+        middle = len(batch) // 2
+        print(f"Batch of {len(batch)} records too large; retrying as two halves")
+        write_batch(supabase, table_name, batch[:middle], method)
+        write_batch(supabase, table_name, batch[middle:], method)
+        return
+    if getattr(response, "error", None):
+        raise RuntimeError(response.error)
+
+
 def write_batches(
     supabase: Client,
     table_name: str,
-    records: Sequence[dict[str, object]],
+    records: Iterable[dict[str, object]],
     *,
-    batch_size: int = 100,
+    batch_size: int = SEED_BATCH_SIZE,
     method: str = "upsert",
 ) -> int:
     """Persist records to Supabase in manageable batches."""
-    if not records:
-        return 0
-
     if method not in {"upsert", "insert"}:
         raise ValueError("method must be either 'upsert' or 'insert'")
 
     try:
-        # Upsert batches – insert in chunks of 100 to respect API limits.
+        # Write batches – large chunks keep the seed round-trip bound work small;
+        # write_batch splits any chunk the API rejects as too large. Up to
+        # SEED_CONCURRENCY batches are in flight at once; the httpx session
+        # behind the client is safe to share between threads. Records are
+        # pulled from the stream only as batches are submitted, so at most a
+        # few batches are held in memory.
         total_inserted = 0
-
-        for i in range(0, len(records), batch_size):
-            batch = records[i : i + batch_size]
-            table = supabase.table(table_name)
-            if method == "insert":
-                response = table.insert(batch).execute()
-            else:
-                response = table.upsert(batch).execute()
-            if getattr(response, "error", None):
-                raise RuntimeError(response.error)
-            total_inserted += len(batch)
-            print(f"Processed batch {i // batch_size + 1}: {len(batch)} records")
+        iterator = iter(records)
+        pending: dict = {}
+
+        def collect(futures) -> None:
+            nonlocal total_inserted
+            for future in futures:
+                future.result()
+                batch_number, batch_length = pending.pop(future)
+                total_inserted += batch_length
+                print(f"Processed batch {batch_number}: {batch_length} records")
+
+        with ThreadPoolExecutor(max_workers=SEED_CONCURRENCY) as executor:
+            batch_number = 0
+            while batch := list(islice(iterator, batch_size)):
+                batch_number += 1
+                future = executor.submit(write_batch, supabase, table_name, batch, method)
+                pending[future] = (batch_number, len(batch))
+                if len(pending) >= SEED_CONCURRENCY * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            collect(list(pending))
 
         return total_inserted
     except Exception as e:
@@ -148,7 +244,12 @@ def seed_loads_table(supabase: Client) -> None:
         print("No loads.json file found; skipping loads seeding.")
         return
 
-    loads = load_seed_data(LOADS_DATA_PATH)
+    digest = file_digest(LOADS_DATA_PATH)
+    if is_already_seeded(supabase, LOADS_TABLE_NAME, digest):
+        return
+
+    # Floats, not Decimals, so the records can be sent as JSON.
+    loads = load_seed_data(LOADS_DATA_PATH, use_float=True)
     table_exists = check_table_exists(supabase, LOADS_TABLE_NAME)
 
     if table_exists:
@@ -162,10 +263,9 @@ def seed_loads_table(supabase: Client) -> None:
         )
         action = "Created table and seeded"
 
-    inserted_count = write_batches(
-        supabase, LOADS_TABLE_NAME, loads, batch_size=100, method="upsert"
-    )
+    inserted_count = write_batches(supabase, LOADS_TABLE_NAME, loads, method="upsert")
     print(f"{action} {LOADS_TABLE_NAME} with {inserted_count} rows")
+    record_seed_digest(supabase, LOADS_TABLE_NAME, digest)
 
 
 def seed_call_logs_table(supabase: Client) -> None:
@@ -174,7 +274,11 @@ def seed_call_logs_table(supabase: Client) -> None:
         print("No call_logs.json file found; skipping call log seeding.")
         return
 
-    call_logs = load_call_log_seed_data(CALL_LOGS_DATA_PATH)
+    digest = file_digest(CALL_LOGS_DATA_PATH)
+    if is_already_seeded(supabase, CALL_LOGS_TABLE_NAME, digest):
+        return
+
+    call_logs = load_call_log_seed_data(CALL_LOGS_DATA_PATH, use_float=True)
     table_exists = check_table_exists(supabase, CALL_LOGS_TABLE_NAME)
 
     if table_exists:
@@ -193,16 +297,29 @@ def seed_call_logs_table(supabase: Client) -> None:
         action = "Created table and seeded"
 
     inserted_count = write_batches(
-        supabase, CALL_LOGS_TABLE_NAME, call_logs, batch_size=100, method="insert"
+        supabase, CALL_LOGS_TABLE_NAME, call_logs, method="insert"
     )
     print(f"{action} {CALL_LOGS_TABLE_NAME} with {inserted_count} rows")
+    record_seed_digest(supabase, CALL_LOGS_TABLE_NAME, digest)
 
 
 def main() -> None:
-    ensure_httpx_proxy_support()
+    # Every batch below goes through this one httpx client, so the TCP/TLS
+    # connection is reused; let its transport retry dropped connections too.
+    # HTTP/2 lets concurrent batches share that connection as separate streams
+    # and HPACK-compresses the apikey/Authorization headers repeated per batch.
+    http_client = httpx.Client(
+        transport=httpx.HTTPTransport(retries=3, http2=True),
+        event_hooks={"response": [_reject_oversized]},
+    )
+
     # Connect to Supabase – initialize client with service-role credentials.
     try:
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
+        supabase: Client = create_client(
+            SUPABASE_URL,
+            SUPABASE_SERVICE_ROLE_KEY,
+            options=ClientOptions(httpx_client=http_client),
+        )
     except Exception as e:
         print(f"Failed to create Supabase client: {e}")
         print(
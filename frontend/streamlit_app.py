@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import requests
 import streamlit as st
+from diskcache import Cache
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 
@@ -14,26 +18,67 @@ load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 # The argument, "LOAD_API_KEY", is the shared secret for the FastAPI server.
 LOAD_API_KEY = os.getenv("LOAD_API_KEY")
+# The argument, "METRICS_CACHE_DIR", is where metrics responses persist across restarts.
+METRICS_CACHE_DIR = os.getenv("METRICS_CACHE_DIR", "/tmp/hr_metrics_cache")
+METRICS_CACHE_TTL_SECONDS = 60
+
+
+# Streamlit re-executes this script on every interaction, so keep the session in
+# cache_resource; that way its keep-alive connections survive reruns instead of
+# paying a fresh TCP/TLS handshake on each cache miss.
+@st.cache_resource
+def get_api_session() -> requests.Session:
+    session = requests.Session()
+    session.mount(API_BASE_URL, HTTPAdapter(pool_connections=2, pool_maxsize=4))
+    if LOAD_API_KEY:
+        session.headers["Authorization"] = f"Bearer {LOAD_API_KEY}"
+    return session
+
+
+# st.cache_data below is per process and empty after every restart. This disk
+# cache is shared by all Streamlit workers on the host and survives restarts, so
+# a warm restart does not have to call the API again.
+@st.cache_resource
+def get_metrics_disk_cache() -> Cache:
+    return Cache(METRICS_CACHE_DIR)
+
+
+def _metrics_cache_key(limit: Optional[int]) -> tuple:
+    # Key on the backend and a hash of its credential so dashboards pointed at
+    # different deployments never read each other's metrics.
+    key_hash = hashlib.sha256((LOAD_API_KEY or "").encode("utf-8")).hexdigest()
+    return ("metrics", API_BASE_URL, key_hash, limit)
 
 
-@st.cache_data(ttl=60)
+# This is the dashboard's only metrics request: /metrics/summary returns every
+# tile's data in one payload, computed by a single query on the backend. New
+# cards should read from the dict passed to the render_* helpers and the endpoint
+# should grow new fields, rather than each card fetching its own data.
+@st.cache_data(ttl=METRICS_CACHE_TTL_SECONDS)
 def fetch_metrics_summary(limit: Optional[int] = None) -> Dict[str, Any]:
+    disk_cache = get_metrics_disk_cache()
+    cache_key = _metrics_cache_key(limit)
+    cached = disk_cache.get(cache_key)
+    if cached is not None:
+        stored_at, payload = cached
+        if time.time() - stored_at < METRICS_CACHE_TTL_SECONDS:
+            return payload
+
     params: Dict[str, Any] = {}
     if limit is not None:
         params["limit"] = limit
 
-    headers: Dict[str, str] = {}
-    if LOAD_API_KEY:
-        headers["Authorization"] = f"Bearer {LOAD_API_KEY}"
-
-    response = requests.get(
+    response = get_api_session().get(
         f"{API_BASE_URL.rstrip('/')}/metrics/summary",
-        headers=headers,
         params=params,
         timeout=10,
     )
     response.raise_for_status()
-    return response.json()
+    payload = response.json()
+    disk_cache.set(
+        cache_key, (time.time(), payload), expire=METRICS_CACHE_TTL_SECONDS
+    )
+    return payload
 
 
 def render_metric_cards(metrics: Dict[str, Any]) -> None:
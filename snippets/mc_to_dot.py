@@ -1,5 +1,42 @@
+import re
+
 import requests
-from bs4 import BeautifulSoup
+
+# Reused across lookups so batch conversions keep one pooled TLS connection to
+# SAFER instead of opening a new one per call.
+_SESSION = requests.Session()
+
+# Matched against the raw HTML rather than parsed page text. In the markup the
+# label and the number sit in separate cells, so skip any tags, whitespace and
+# &nbsp; between them. DOT numbers are 5–8 digits.
+_DOT_RE = re.compile(rb"USDOT Number:(?:\s|&nbsp;|<[^>]*>)*(\d+)", re.IGNORECASE)
+
+
+# MC -> DOT assignments do not change, so repeat lookups of the same carrier are
+# answered from memory. Only found numbers are kept: a carrier missing today may
+# be registered tomorrow, and failed requests raise so the next call retries.
+_DOT_CACHE: dict[str, str] = {}
+_DOT_CACHE_MAX = 4096
+
+
+def _lookup_dot(mc_number: str) -> str | None:
+    cached = _DOT_CACHE.get(mc_number)
+    if cached is not None:
+        return cached
+
+    url = f"https://safer.fmcsa.dot.gov/CompanySnapshot.aspx?query_string={mc_number}&query_type=MC"
+    resp = _SESSION.get(url, timeout=10)
+    resp.raise_for_status()
+
+    match = _DOT_RE.search(resp.content)
+    if match is None:
+        return None
+
+    if len(_DOT_CACHE) >= _DOT_CACHE_MAX:
+        # Dicts keep insertion order, so this drops the oldest entry.
+        del _DOT_CACHE[next(iter(_DOT_CACHE))]
+    dot_number = _DOT_CACHE[mc_number] = match.group(1).decode()
+    return dot_number
 
 
 def mc_to_dot(mc_number: str) -> str | None:
@@ -7,26 +44,12 @@ def mc_to_dot(mc_number: str) -> str | None:
     Convert an MC number to a DOT number using FMCSA SAFER search.
     Returns DOT number as string or None if not found.
     """
-    url = f"https://safer.fmcsa.dot.gov/CompanySnapshot.aspx?query_string={mc_number}&query_type=MC"
-    resp = requests.get(url)
-
-    if resp.status_code != 200:
+    try:
+        return _lookup_dot(mc_number.strip())
+    except requests.RequestException:
         print("Error: FMCSA request failed.")
         return None
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    text = soup.get_text()
-
-    # Very rough: find DOT number pattern in page text
-    # DOT numbers are 5–8 digits
-    import re
-
-    match = re.search(r"USDOT Number: (\d+)", text)
-    if match:
-        return match.group(1)
-
-    return None
-
 
 # Example usage
 if __name__ == "__main__":